@@ -1,4 +1,5 @@
 import os
+import re
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -34,6 +35,12 @@ def is_generic_title(title: str) -> bool:
     t = (title or "").strip().lower()
     return (not t) or any(m in t for m in GENERIC_MARKERS)
 
+# " NV", " Non-Vintage" and " non-vintage" markers, matched in a single pass
+NON_VINTAGE_RE = re.compile(r" (?:NV|Non-Vintage|non-vintage)")
+
+def is_non_vintage(title: str) -> bool:
+    return NON_VINTAGE_RE.search(title or "") is not None
+
 def is_price_valid(x) -> bool:
     try:
         return x is not None and float(x) >= 5.0
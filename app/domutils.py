@@ -1,6 +1,9 @@
 # Minimal CTA-scoped extraction used as a fallback when no MO signal yet.
 import re
 
+# "Last Bottle" price text as returned by the in-page extractor, e.g. "$1,299.00"
+_PRICE_RE = re.compile(r"\$?\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.\d{2})?|\d+(?:\.\d{2})?)")
+
 async def extract_from_cta(page):
     out = await page.evaluate("""
       () => {
@@ -33,13 +36,24 @@ async def extract_from_cta(page):
             }
           }
           
-          // Second priority: Look for any element that contains "last bottle" text near a price
-          const elements = container.querySelectorAll('*');
-          for (const el of elements) {
-            const text = (el.innerText || '').toLowerCase();
-            if (text.includes('last bottle') && text.includes('$')) {
-              const m = text.match(money);
-              if (m) return m[0];
+          // Second priority: Look for any element that contains "last bottle" text near a price.
+          // Skipped outright when the container's textContent never mentions "last bottle":
+          // unlike innerText it needs no layout and includes hidden descendants, whose own
+          // innerText the walk below can still match. Whitespace is collapsed first because
+          // textContent keeps source line breaks that innerText would render as one space.
+          // Otherwise one XPath pass keeps only elements whose text contains a "$", so
+          // innerText (which forces layout) runs on a few candidates.
+          const boxContent = (container.textContent || '').replace(/\\s+/g, ' ').toLowerCase();
+          if (boxContent.includes('last bottle')) {
+            const candidates = document.evaluate(".//*[contains(., '$')]", container, null,
+                                                 XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            for (let i = 0; i < candidates.snapshotLength; i++) {
+              const el = candidates.snapshotItem(i);
+              const text = (el.innerText || '').toLowerCase();
+              if (text.includes('last bottle') && text.includes('$')) {
+                const m = text.match(money);
+                if (m) return m[0];
+              }
             }
           }
           
@@ -53,7 +67,8 @@ async def extract_from_cta(page):
               if (m) return m[0];
             }
           }
-          const scrub = (container.innerText||'').replace(/you save.*?\\$[\\d.,]+/ig,'');
+          const boxText = container.innerText || '';
+          const scrub = boxText.replace(/you save.*?\\$[\\d.,]+/ig,'');
           const m = scrub.match(money);
           return m ? m[0] : null;
         }
@@ -67,7 +82,7 @@ async def extract_from_cta(page):
     title = (out.get('title') or '').strip()
     price = None
     if out.get('priceText'):
-        m = re.search(r"\$?\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.\d{2})?|\d+(?:\.\d{2})?)", out['priceText'])
+        m = _PRICE_RE.search(out['priceText'])
         if m:
             try: price = float(m.group(1).replace(',', ''))
             except: pass
@@ -1,16 +1,96 @@
 """Data models for the wine deal scanner."""
 
-from pydantic import BaseModel, Field
+import re
+from functools import lru_cache
+
+from pydantic import BaseModel, ConfigDict, Field
+
+DEFAULT_BOTTLE_SIZE_ML = 750
+
+# Named bottle formats, matched as whole words on the lowercased title before
+# any numeric size: one precompiled alternation, then a dict lookup on the hit.
+# "double magnum" is listed before "magnum" so the longer name wins at the same
+# position, and "demi" is skipped when it is part of "Demi-Sec".
+_NAMED_SIZES = {
+    "double magnum": 3000,
+    "magnum": 1500,
+    "half bottle": 375,
+    "demi": 375,
+    "split": 187,
+    "piccolo": 187,
+    "jeroboam": 3000,
+    "imperial": 6000,
+}
+_NAMED_SIZE_RE = re.compile(
+    r"\b(double magnum|magnum|half bottle|demi(?!-sec)|split|piccolo|jeroboam|imperial)\b"
+)
+
+# Explicit sizes like "375 ml" or "1.5L"; the first plausible one in the title wins
+_NUMERIC_SIZE_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(ml|l)\b")
+_MIN_ML, _MAX_ML = 100, 6000
+
+
+@lru_cache(maxsize=512)
+def normalize_bottle_size(text: str | None) -> int:
+    """Return the bottle size in ml mentioned in a title, defaulting to 750."""
+    if not text:
+        return DEFAULT_BOTTLE_SIZE_ML
+    lower = text.lower()
+
+    m = _NAMED_SIZE_RE.search(lower)
+    if m:
+        return _NAMED_SIZES[m.group(1)]
+
+    # Every numeric size ends in "ml" or "l"; without an "l" the regex cannot match
+    if "l" not in lower:
+        return DEFAULT_BOTTLE_SIZE_ML
+
+    for m in _NUMERIC_SIZE_RE.finditer(lower):
+        amount = float(m.group(1))
+        ml = round(amount if m.group(2) == "ml" else amount * 1000)
+        if _MIN_ML <= ml <= _MAX_ML:
+            return ml
+
+    return DEFAULT_BOTTLE_SIZE_ML
 
 
 class Deal(BaseModel):
     """Represents a wine deal from LastBottle."""
 
+    model_config = ConfigDict(frozen=True)
+
     title: str = Field(..., description="Wine name/title")
     price: float = Field(..., gt=0, description="Current sale price")
-    bottle_size_ml: int = Field(750, description="Bottle size in milliliters")
+    bottle_size_ml: int = Field(DEFAULT_BOTTLE_SIZE_ML, description="Bottle size in milliliters")
     url: str = Field(..., description="URL to the deal page")
 
     def __str__(self) -> str:
         """String representation of the deal."""
-        return f"{self.title}: ${self.price:.2f}"
\ No newline at end of file
+        return f"{self.title}: ${self.price:.2f}"
+
+
+class EnrichedDeal(BaseModel):
+    """A deal combined with the Vivino data found for it."""
+
+    model_config = ConfigDict(frozen=True)
+
+    wine_name: str = Field(..., description="Wine name without vintage")
+    vintage: int | None = Field(None, description="Vintage year, None for NV wines")
+    bottle_size_ml: int = Field(DEFAULT_BOTTLE_SIZE_ML, description="Bottle size in milliliters")
+    deal_price: float = Field(..., gt=0, description="LastBottle deal price")
+
+    vintage_rating: float | None = Field(None, description="Vivino rating for this vintage")
+    vintage_price: float | None = Field(None, description="Vivino average price for this vintage")
+    vintage_reviews: int | None = Field(None, description="Vivino review count for this vintage")
+
+    overall_rating: float | None = Field(None, description="Vivino rating across all vintages")
+    overall_price: float | None = Field(None, description="Vivino average price across all vintages")
+    overall_reviews: int | None = Field(None, description="Vivino review count across all vintages")
+
+    @property
+    def has_vivino_data(self) -> bool:
+        """True when any Vivino field is populated."""
+        return any(v is not None for v in (
+            self.vintage_rating, self.vintage_price, self.vintage_reviews,
+            self.overall_rating, self.overall_price, self.overall_reviews,
+        ))
@@ -2,8 +2,19 @@
 
 import httpx
 import os
+import structlog
 from urllib.parse import quote
 from app import config
+from app.models import EnrichedDeal
+
+logger = structlog.get_logger(__name__)
+
+TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "")
+TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
+
+
+class TelegramError(Exception):
+    """Raised when the Telegram Bot API rejects a message."""
 
 
 def _fmt_triplet(t):
@@ -25,8 +36,12 @@ def _fmt_triplet(t):
     return out if out else None
 
 
-async def telegram_send(deal, vivino_data):
-    """Send Telegram notification for a wine deal."""
+async def telegram_send(deal, vivino_data, client: httpx.AsyncClient | None = None):
+    """Send Telegram notification for a wine deal.
+
+    Pass a long-lived ``client`` to reuse its keep-alive connection to the Bot API;
+    otherwise a one-off client is opened and closed for this message.
+    """
     token = os.getenv("TELEGRAM_BOT_TOKEN", "")
     chat_id = os.getenv("TELEGRAM_CHAT_ID", "")
     
@@ -37,7 +52,7 @@ async def telegram_send(deal, vivino_data):
         vintage, overall, vintage_year = (vivino_data or (None, None)) + (None,)
     
     # Check if this is a non-vintage wine
-    is_non_vintage = ' NV' in (deal.title or '') or ' Non-Vintage' in (deal.title or '') or ' non-vintage' in (deal.title or '')
+    is_non_vintage = config.is_non_vintage(deal.title)
 
     price_line = "Price: " + (f"${deal.price:.2f}" if config.is_price_valid(getattr(deal,'price',0)) else "—")
     
@@ -96,10 +111,118 @@ async def telegram_send(deal, vivino_data):
         print("[notify] preview:", text[:120])
 
     if token and chat_id:
-        async with httpx.AsyncClient(timeout=10) as client:
-            r = await client.post(f"https://api.telegram.org/bot{token}/sendMessage",
-                                  json={"chat_id": chat_id, "text": text})
-            if config.DEBUG:
-                print("[notify] status:", r.status_code, "body:", r.text)
-            return True, r.status_code, r.text
-    return False, 0, ""
\ No newline at end of file
+        url = f"https://api.telegram.org/bot{token}/sendMessage"
+        payload = {"chat_id": chat_id, "text": text}
+        if client is not None:
+            r = await client.post(url, json=payload, timeout=10)
+        else:
+            async with httpx.AsyncClient(timeout=10) as own_client:
+                r = await own_client.post(url, json=payload)
+        if config.DEBUG:
+            print("[notify] status:", r.status_code, "body:", r.text)
+        return True, r.status_code, r.text
+    return False, 0, ""
+
+
+# One fixed template per (rating, price, reviews) presence mask, so a Vivino line
+# is a single format call listing only the known parts, joined by " — "
+_VIVINO_TEMPLATES = {
+    0b111: "Vivino ({label}): {r:.1f}⭐ — avg (${p:.2f}) — {n} reviews",
+    0b110: "Vivino ({label}): {r:.1f}⭐ — avg (${p:.2f})",
+    0b101: "Vivino ({label}): {r:.1f}⭐ — {n} reviews",
+    0b100: "Vivino ({label}): {r:.1f}⭐",
+    0b011: "Vivino ({label}): avg (${p:.2f}) — {n} reviews",
+    0b010: "Vivino ({label}): avg (${p:.2f})",
+    0b001: "Vivino ({label}): {n} reviews",
+}
+
+
+def _format_vivino_line(label: str, rating: float | None, price: float | None,
+                        reviews: int | None) -> str | None:
+    """Format one Vivino line, or None when there is no data for it."""
+    mask = (rating is not None) << 2 | (price is not None) << 1 | (reviews is not None)
+    if not mask:
+        return None
+    return _VIVINO_TEMPLATES[mask].format(label=label, r=rating, p=price, n=reviews)
+
+
+def _format_enriched_deal_message(enriched: EnrichedDeal) -> str:
+    """Build the Telegram message for an enriched deal."""
+    vintage = f" {enriched.vintage}" if enriched.vintage is not None else ""
+    base = (f"🍷 New Deal: {enriched.wine_name}{vintage}\n"
+            f"Size: {enriched.bottle_size_ml}ml\n"
+            f"Deal Price: ${enriched.deal_price:.2f}")
+
+    # Without Vivino data there are no optional lines to collect
+    if not enriched.has_vivino_data:
+        return base
+
+    lines = [base]
+
+    for label, rating, price, reviews in (
+        ("vintage", enriched.vintage_rating, enriched.vintage_price, enriched.vintage_reviews),
+        ("overall", enriched.overall_rating, enriched.overall_price, enriched.overall_reviews),
+    ):
+        line = _format_vivino_line(label, rating, price, reviews)
+        if line:
+            lines.append(line)
+
+    # Savings against the vintage average when known, else the overall average
+    avg_price = enriched.vintage_price if enriched.vintage_price is not None else enriched.overall_price
+    savings = avg_price - enriched.deal_price if avg_price else 0.0
+    if savings > 0:
+        pct = savings * 100.0 / avg_price
+        lines.append(f"💰 Save ${savings:.2f} ({pct:.1f}% off Vivino avg)")
+
+    return "\n".join(lines)
+
+
+async def _send_telegram_message(chat_id: str, message: str, timeout_s: float = 10.0,
+                                 client: httpx.AsyncClient | None = None) -> None:
+    """POST a message to the Telegram Bot API, raising TelegramError on rejection."""
+    url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
+    payload = {"chat_id": chat_id, "text": message}
+    if client is not None:
+        r = await client.post(url, json=payload, timeout=timeout_s)
+    else:
+        async with httpx.AsyncClient(timeout=timeout_s) as own_client:
+            r = await own_client.post(url, json=payload)
+    if r.status_code != 200:
+        raise TelegramError(f"HTTP {r.status_code}: {r.text[:200]}")
+
+
+async def send_telegram_message(enriched: EnrichedDeal, timeout_s: float = 10.0,
+                                client: httpx.AsyncClient | None = None) -> bool:
+    """Format and send an enriched deal; returns False instead of raising on failure.
+
+    ``client`` is passed through to reuse a shared connection to the Bot API.
+    """
+    chat_id = TELEGRAM_CHAT_ID  # one global read per send; still patchable in tests
+    logger.info(
+        "Sending Telegram notification",
+        wine_name=enriched.wine_name,
+        vintage=enriched.vintage,
+        deal_price=enriched.deal_price,
+        has_vivino_data=enriched.has_vivino_data,
+    )
+    try:
+        message = _format_enriched_deal_message(enriched)
+        await _send_telegram_message(chat_id, message, timeout_s=timeout_s, client=client)
+    except TelegramError as e:
+        logger.error("Telegram API error", wine_name=enriched.wine_name, error=str(e))
+        return False
+    except (TimeoutError, httpx.TimeoutException) as e:
+        logger.error("Telegram request timed out", wine_name=enriched.wine_name, error=str(e))
+        return False
+    except Exception as e:
+        logger.error("Unexpected error sending Telegram notification",
+                     wine_name=enriched.wine_name, error=str(e))
+        return False
+
+    logger.info(
+        "Telegram notification sent successfully",
+        wine_name=enriched.wine_name,
+        vintage=enriched.vintage,
+        chat_id=chat_id,
+    )
+    return True
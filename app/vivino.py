@@ -1,9 +1,52 @@
 import re
+from functools import lru_cache
 from urllib.parse import quote
 import httpx
-from playwright.async_api import async_playwright
+from rapidfuzz import fuzz
 from app import config
 
+# First wine-card link on the current page, resolved in the same evaluate() as the
+# card text: one round-trip instead of one eval_on_selector per candidate selector.
+_CARD_LINK_JS = """
+        const linkSelectors = [
+          '[data-cy*="wineCard"] a',
+          '[data-testid*="wine-card"] a',
+          '[class*="WineCard"] a',
+          '.wine-card a',
+          'a[href*="/wines/"]',
+          'a[href*="/w/"]'
+        ];
+        let link = null;
+        for (const s of linkSelectors) {
+          const el = document.querySelector(s);
+          if (!el) continue;
+          link = el.href;
+          if (typeof link === 'string' && link.includes('vivino.com')
+              && (link.includes('/wines/') || link.includes('/w/'))) break;
+        }
+"""
+
+# lookup()'s rating patterns in priority order, compiled once at import rather
+# than looked up in re's cache on every call
+_RATING_LADDER = tuple(re.compile(p, re.I | re.MULTILINE | re.DOTALL) for p in (
+    # Look for overall wine data first (higher review counts typically indicate overall)
+    r'\b(\d\.\d)\b\s*(?=\d{4,}\s+ratings?)',          # 4.1 followed by 4+ digit review count (overall)
+    r'\b(\d\.\d)\b\s*\n.*?(?=\d{4,}\s+ratings?)',     # 4.1 on line before high review count
+    r'\b(\d\.\d)\b\s*(?:★|stars?)',                    # 4.0 ★ or 4.0 stars
+    r'Rating\s*(\d\.\d)',                              # Rating 4.0  
+    r'(\d\.\d)\s*(?:out of|/)\s*5',                    # 4.0 out of 5 or 4.0/5
+    r'(\d\.\d)\s*⭐',                                   # 4.0 ⭐
+    r'\b(\d\.\d)\s*\n.*?ratings?',                     # 4.0 followed by ratings on next line
+    r'\b(\d\.\d)\b(?=\s*\d+\s+ratings?)',              # 4.0 followed by number ratings
+    r'\b(\d\.\d)\s*\n.*?based on all vintages',        # 4.2\nbased on all vintages
+    r'\b(\d\.\d)\b(?=.*?based on all vintages)',       # 4.2 ... based on all vintages
+    r'\b(\d\.\d)\b',                                   # Just the rating number (last resort)
+))
+
+# Year and label modifiers dropped from a query for the security-challenge fallback
+_QUERY_YEAR_RE = re.compile(r'\b(19|20)\d{2}\b')
+_QUERY_MODIFIERS_RE = re.compile(r'\b(Grand Cru|Premier Cru|Reserve|Special|Limited)\b', re.I)
+
 # ALWAYS return (rating, count, avg_price, url) – allow None
 async def lookup(page, query: str):
     import random
@@ -42,15 +85,15 @@ async def lookup(page, query: str):
         if config.DEBUG: print(f"[vivino.debug] page load issue: {e}")
         # Continue anyway, might still get some content
 
-    text = await page.evaluate("""
-      () => {
+    found = await page.evaluate("""
+      () => {""" + _CARD_LINK_JS + """
         // First try to get the wine card from search results
         const card = document.querySelector('[data-cy*="searchPage"] [data-cy*="wineCard"]')
                   || document.querySelector('[data-testid*="wine-card"]')
                   || document.querySelector('[class*="WineCard"]');
         
         if (card) {
-          return card.innerText;
+          return { text: card.innerText, link };
         }
         
         // If no card found, check if we're on a wine page directly
@@ -59,21 +102,23 @@ async def lookup(page, query: str):
                       || document.querySelector('main');
         
         if (winePage) {
-          return winePage.innerText;
+          return { text: winePage.innerText, link };
         }
         
         // Fallback to body
-        return document.body.innerText;
+        return { text: document.body.innerText, link };
       }
     """)
+    text, link = found['text'], found['link']
     
-    # Check for security challenge and try fallback
-    if "let's confirm you are human" in text.lower() or "security check" in text.lower():
+    # Check for security challenge and try fallback (lowercase the page text once)
+    text_lower = text.lower()
+    if "let's confirm you are human" in text_lower or "security check" in text_lower:
         if config.DEBUG: print("[vivino.debug] security challenge detected, trying fallback")
         try:
             # Extract just the producer and wine type for a broader search
-            simplified_query = re.sub(r'\b(19|20)\d{2}\b', '', query)  # Remove year
-            simplified_query = re.sub(r'\b(Grand Cru|Premier Cru|Reserve|Special|Limited)\b', '', simplified_query, flags=re.I)  # Remove modifiers
+            simplified_query = _QUERY_YEAR_RE.sub('', query)  # Remove year
+            simplified_query = _QUERY_MODIFIERS_RE.sub('', simplified_query)  # Remove modifiers
             simplified_query = ' '.join(simplified_query.split()[:3])  # Take first 3 words
             
             if simplified_query.strip() and simplified_query != query:
@@ -82,44 +127,32 @@ async def lookup(page, query: str):
                 await page.goto(f"https://www.vivino.com/search/wines?q={quote(simplified_query)}", wait_until="domcontentloaded")
                 await asyncio.sleep(random.uniform(1.0, 2.0))
                 
-                fallback_text = await page.evaluate("""
-                  () => {
+                fallback = await page.evaluate("""
+                  () => {""" + _CARD_LINK_JS + """
                     const card = document.querySelector('[data-cy*="searchPage"] [data-cy*="wineCard"]')
                               || document.querySelector('[data-testid*="wine-card"]')
                               || document.querySelector('[class*="WineCard"]');
-                    return card ? card.innerText : document.body.innerText;
+                    return { text: card ? card.innerText : document.body.innerText, link };
                   }
                 """)
+                fallback_text = fallback['text']
                 
-                if fallback_text and "let's confirm you are human" not in fallback_text.lower():
-                    text = fallback_text
+                fallback_lower = (fallback_text or "").lower()
+                if fallback_text and "let's confirm you are human" not in fallback_lower:
+                    text, text_lower = fallback_text, fallback_lower
+                    link = fallback['link']
                     if config.DEBUG: print("[vivino.debug] fallback search succeeded")
         except Exception as e:
             if config.DEBUG: print(f"[vivino.debug] fallback failed: {e}")
         
-        if "let's confirm you are human" in text.lower():
+        if "let's confirm you are human" in text_lower:
             if config.DEBUG: print("[vivino.debug] still blocked after fallback")
             return (None, None, None, None)
 
     rating = None
     # Try multiple rating patterns - prioritize overall wine data
-    rating_patterns = [
-        # Look for overall wine data first (higher review counts typically indicate overall)
-        r'\b(\d\.\d)\b\s*(?=\d{4,}\s+ratings?)',          # 4.1 followed by 4+ digit review count (overall)
-        r'\b(\d\.\d)\b\s*\n.*?(?=\d{4,}\s+ratings?)',     # 4.1 on line before high review count
-        r'\b(\d\.\d)\b\s*(?:★|stars?)',                    # 4.0 ★ or 4.0 stars
-        r'Rating\s*(\d\.\d)',                              # Rating 4.0  
-        r'(\d\.\d)\s*(?:out of|/)\s*5',                    # 4.0 out of 5 or 4.0/5
-        r'(\d\.\d)\s*⭐',                                   # 4.0 ⭐
-        r'\b(\d\.\d)\s*\n.*?ratings?',                     # 4.0 followed by ratings on next line
-        r'\b(\d\.\d)\b(?=\s*\d+\s+ratings?)',              # 4.0 followed by number ratings
-        r'\b(\d\.\d)\s*\n.*?based on all vintages',        # 4.2\nbased on all vintages
-        r'\b(\d\.\d)\b(?=.*?based on all vintages)',       # 4.2 ... based on all vintages
-        r'\b(\d\.\d)\b',                                   # Just the rating number (last resort)
-    ]
-    
-    for pattern in rating_patterns:
-        m = re.search(pattern, text, re.I | re.MULTILINE | re.DOTALL)
+    for pattern in _RATING_LADDER:
+        m = pattern.search(text)
         if m:
             try: 
                 rating = float(m.group(1))
@@ -130,7 +163,7 @@ async def lookup(page, query: str):
 
     count = None
     # Look for all review count patterns and pick the highest (likely overall data)
-    review_matches = re.findall(r'(\d{1,3}(?:,\d{3})*)\s+ratings?', text, re.I)
+    review_matches = _PAGE_COUNT_RE.findall(text)
     if review_matches:
         try:
             # Convert all matches to integers and pick the highest
@@ -142,32 +175,13 @@ async def lookup(page, query: str):
             pass
 
     avg_price = None
-    m = re.search(r'\$\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{2})?)', text)
+    m = PRICE_RE.search(text)
     if m:
         try: avg_price = float(m.group(1).replace(',', ''))
         except: pass
 
-    # Try to grab first card link - try multiple selectors
-    link = None
+    # First card link was resolved in the page together with the text
     try:
-        # Try different selectors for wine card links
-        selectors = [
-            '[data-cy*="wineCard"] a',
-            '[data-testid*="wine-card"] a', 
-            '[class*="WineCard"] a',
-            '.wine-card a',
-            'a[href*="/wines/"]',
-            'a[href*="/w/"]'
-        ]
-        
-        for selector in selectors:
-            try:
-                link = await page.eval_on_selector(selector, 'el => el.href')
-                if isinstance(link, str) and 'vivino.com' in link and ('/wines/' in link or '/w/' in link):
-                    break
-            except:
-                continue
-        
         # Validate and clean the link
         if not isinstance(link, str) or 'vivino.com' not in link:
             link = None
@@ -219,6 +233,8 @@ async def get_vivino_info(wine_name: str, vintage: int | None = None) -> dict:
     Returns dict with vintage and overall data.
     """
     try:
+        # Imported here so parsing-only callers don't pay for loading Playwright
+        from playwright.async_api import async_playwright
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
             ctx = await browser.new_context(user_agent=config.USER_AGENT, locale="en-US")
@@ -267,38 +283,71 @@ async def get_vivino_info(wine_name: str, vintage: int | None = None) -> dict:
         }
 
 
-async def resolve_vivino_url(query: str, timeout_s: float = 2.0) -> str | None:
-    """Resolve Vivino URL for a wine query."""
+async def _resolve_with_browser(browser, query: str) -> str | None:
+    """Run a single lookup in a fresh context on an already-launched browser."""
+    ctx = await browser.new_context(user_agent=config.USER_AGENT, locale="en-US")
     try:
+        page = await ctx.new_page()
+        result = await lookup(page, query)
+    finally:
+        await ctx.close()
+    
+    if result and len(result) > 3 and result[3]:
+        return result[3]
+    return None
+
+
+async def resolve_vivino_url(query: str, timeout_s: float = 2.0, browser=None) -> str | None:
+    """
+    Resolve Vivino URL for a wine query.
+    Pass a launched browser to reuse it; otherwise Chromium is started for this call.
+    """
+    try:
+        if browser is not None:
+            return await _resolve_with_browser(browser, query)
+        
+        from playwright.async_api import async_playwright
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
-            ctx = await browser.new_context(user_agent=config.USER_AGENT, locale="en-US")
-            page = await ctx.new_page()
-            
-            result = await lookup(page, query)
-            await ctx.close()
-            await browser.close()
-            
-            if result and len(result) > 3 and result[3]:
-                return result[3]
-            return None
+            try:
+                return await _resolve_with_browser(browser, query)
+            finally:
+                await browser.close()
     except Exception:
         return None
 
 
-async def _fetch_vivino_page(url: str, timeout_s: float = 2.0) -> str | None:
-    """Fetch HTML content from Vivino page."""
+async def _fetch_vivino_page(url: str, timeout_s: float = 2.0,
+                             client: httpx.AsyncClient | None = None) -> str | None:
+    """Fetch HTML content from Vivino page.
+
+    Pass a long-lived ``client`` to reuse its keep-alive connection across calls;
+    otherwise a one-off client is opened and closed for this request.
+    """
+    headers = {'User-Agent': config.USER_AGENT}
     try:
-        async with httpx.AsyncClient(timeout=timeout_s) as client:
-            response = await client.get(url, headers={
-                'User-Agent': config.USER_AGENT
-            })
-            response.raise_for_status()
-            return response.text
+        if client is not None:
+            response = await client.get(url, headers=headers, timeout=timeout_s)
+        else:
+            async with httpx.AsyncClient(timeout=timeout_s) as own_client:
+                response = await own_client.get(url, headers=headers)
+        response.raise_for_status()
+        return response.text
     except Exception:
         return None
 
 
+# parse_vivino_page patterns, compiled once. Kept as separate searches: each
+# one's literal prefix lets re skip ahead, which beats a single fused scan
+# over a full page of HTML.
+_PAGE_STAR_RE = re.compile(r'\b(\d\.\d)\b\s*(?:★|stars?)', re.I)
+_PAGE_LABEL_RE = re.compile(r'Rating\s*(\d\.\d)', re.I)
+# Possessive: a shorter digit or ",ddd" run is always followed by a digit or
+# comma, never the whitespace that has to come next, so giving digits back
+# could never produce a match; it only costs time on long numeric runs.
+_PAGE_COUNT_RE = re.compile(r'(\d{1,3}+(?:,\d{3})*+)\s+ratings?', re.I)
+
+
 def parse_vivino_page(html: str) -> dict:
     """Parse Vivino page HTML for wine data."""
     if not html:
@@ -306,21 +355,19 @@ def parse_vivino_page(html: str) -> dict:
     
     # Use regex parsing similar to lookup function
     rating = None
-    m = re.search(r'\b(\d\.\d)\b\s*(?:★|stars?)', html, re.I)
-    if not m:
-        m = re.search(r'Rating\s*(\d\.\d)', html, re.I)
+    m = _PAGE_STAR_RE.search(html) or _PAGE_LABEL_RE.search(html)
     if m:
         try: rating = float(m.group(1))
         except: pass
 
     count = None
-    m = re.search(r'(\d{1,3}(?:,\d{3})*)\s+ratings?', html, re.I)
+    m = _PAGE_COUNT_RE.search(html)
     if m:
         try: count = int(m.group(1).replace(',', ''))
         except: pass
 
     avg_price = None
-    m = re.search(r'\$\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{2})?)', html)
+    m = PRICE_RE.search(html)
     if m:
         try: avg_price = float(m.group(1).replace(',', ''))
         except: pass
@@ -332,6 +379,10 @@ def parse_vivino_page(html: str) -> dict:
     }
 
 
+_WHITESPACE_RE = re.compile(r'\s+')
+_SEARCH_PUNCT_RE = re.compile(r'[^\w\s\-\.]')
+
+
 # Additional backward compatibility functions for tests
 def _normalize_wine_name(name: str) -> str:
     """Normalize wine name for search."""
@@ -341,9 +392,9 @@ def _normalize_wine_name(name: str) -> str:
     # Basic normalization
     normalized = name.strip().lower()
     # Remove extra whitespace
-    normalized = re.sub(r'\s+', ' ', normalized)
+    normalized = _WHITESPACE_RE.sub(' ', normalized)
     # Remove common punctuation that might interfere with search
-    normalized = re.sub(r'[^\w\s\-\.]', '', normalized)
+    normalized = _SEARCH_PUNCT_RE.sub('', normalized)
     
     return normalized
 
@@ -398,60 +449,56 @@ def _extract_wine_data(wine_data: dict) -> dict:
 
 
 # Regex patterns for parsing (backward compatibility)
-RATING_RE = re.compile(r'\b(\d\.\d)\b\s*(?:★|stars?)', re.I)
-COUNT_RE = re.compile(r'(\d{1,3}(?:,\d{3})*)\s+ratings?', re.I)
+RATING_RE = re.compile(r'(\d[\.,]\d)(?:\s*/5)?')
+# The lookbehind keeps a match from starting mid-number and the possessive run
+# never gives digits back, so a long digit run with no "ratings" after it fails
+# in linear time instead of retrying from every digit. Matches are unchanged:
+# the leftmost match always starts at the first digit of its run.
+COUNT_RE = re.compile(r'(\d(?<!\d\d)[\d,\.]*+)\s*(ratings|reviews)', re.I)
 PRICE_RE = re.compile(r'\$\s*([0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{2})?)')
 
-
-def _parse_stats(text: str) -> dict:
-    """Parse stats from text using regex patterns."""
+# The three patterns above fused into one alternation so _parse_stats scans the
+# text once. Count comes first: otherwise the rating branch would claim the
+# "1,2" of "1,234 ratings" before the count branch could see it.
+_STATS_RE = re.compile(
+    r'(?P<count>\d(?<!\d\d)[\d,\.]*+)\s*(?:ratings|reviews)'
+    r'|(?P<rating>\d[\.,]\d)(?:\s*/5)?'
+    r'|\$\s*(?P<price>[0-9]{1,3}(?:,[0-9]{3})*(?:\.[0-9]{2})?)',
+    re.I,
+)
+
+
+@lru_cache(maxsize=256)
+def _parse_stats(text: str) -> tuple[float | None, int | None, float | None]:
+    """Parse (rating, count, price) from text; the first match of each wins."""
+    rating = count = price = None
     if not text:
-        return {"rating": None, "count": None, "price": None}
-    
-    rating = None
-    rating_match = RATING_RE.search(text)
-    if rating_match:
-        try:
-            rating = float(rating_match.group(1))
-        except:
-            pass
-    
-    count = None
-    count_match = COUNT_RE.search(text)
-    if count_match:
-        try:
-            count = int(count_match.group(1).replace(',', ''))
-        except:
-            pass
-    
-    price = None
-    price_match = PRICE_RE.search(text)
-    if price_match:
+        return rating, count, price
+
+    for m in _STATS_RE.finditer(text):
+        kind = m.lastgroup
         try:
-            price = float(price_match.group(1).replace(',', ''))
-        except:
+            if kind == 'count' and count is None:
+                count = int(m.group('count').replace(',', '').replace('.', ''))
+            elif kind == 'rating' and rating is None:
+                rating = float(m.group('rating').replace(',', '.'))
+            elif kind == 'price' and price is None:
+                price = float(m.group('price').replace(',', ''))
+        except ValueError:
             pass
-    
-    return {
-        "rating": rating,
-        "count": count,
-        "price": price
-    }
+        if rating is not None and count is not None and price is not None:
+            break
+
+    return rating, count, price
 
 
-def _score_match(text: str, query: str) -> float:
-    """Score how well text matches query (simple implementation)."""
+def _score_match(query: str, text: str) -> float:
+    """Score 0-100 how well a Vivino listing ``text`` matches ``query``."""
     if not text or not query:
         return 0.0
-    
-    text_lower = text.lower()
-    query_lower = query.lower()
-    
-    # Simple scoring based on word matches
-    query_words = query_lower.split()
-    matches = sum(1 for word in query_words if word in text_lower)
-    
-    return matches / len(query_words) if query_words else 0.0
+    # WRatio blends full, partial and token-set ratios, so a short query inside
+    # a longer listing still scores high while unrelated names stay low
+    return fuzz.WRatio(query.lower(), text.lower())
 
 
 async def _search_vivino_comprehensive(client, query: str, search_type: str = "general"):
@@ -1,6 +1,7 @@
 import asyncio
 import random
 import re
+import httpx
 from playwright.async_api import async_playwright
 from app import config
 from app.notify import telegram_send
@@ -8,6 +9,12 @@ from app.models import Deal
 from app.domutils import extract_from_cta
 from app.keep_awake import start_keep_awake, stop_keep_awake
 
+# Vintage year in a LastBottle title, e.g. "Chateau Margaux 2015"
+_VINTAGE_RE = re.compile(r'\b(19|20)\d{2}\b')
+
+# Vivino rate-limits aggressively; only one deal's searches may run at a time
+_VIVINO_SEARCHES = asyncio.Semaphore(1)
+
 def _deal_id(title: str) -> str:
     """Create a simple deal ID from the title"""
     return (title or "").strip().lower()
@@ -149,6 +156,68 @@ async def enhanced_vivino_lookup(browser, query: str):
         except:
             pass
 
+async def _notify_deal(browser, deal: Deal, title: str, telegram_client) -> bool:
+    """Look up Vivino data for a new deal and send its notification; True if sent."""
+    # Try to get Vivino data
+    vivino_data = None
+    try:
+        # One deal's searches at a time, keeping their spacing if deals overlap
+        async with _VIVINO_SEARCHES:
+            print("[enhanced] Looking up Vivino data...")
+        
+            # Check if this is a non-vintage wine
+            is_non_vintage = config.is_non_vintage(title)
+        
+            # Extract vintage year
+            vintage_year = None
+            if not is_non_vintage:
+                year_match = _VINTAGE_RE.search(title)
+                vintage_year = year_match.group(0) if year_match else None
+        
+            # Create queries
+            with_vintage_query = title
+            without_vintage_query = _VINTAGE_RE.sub('', title).strip() if vintage_year else title
+        
+            # Search for overall data (without vintage)
+            overall_result = None
+            if without_vintage_query != with_vintage_query or is_non_vintage:
+                overall_result = await enhanced_vivino_lookup(browser, without_vintage_query)
+                if config.DEBUG:
+                    print(f"[enhanced] Overall search result: {overall_result}")
+        
+            # Search for vintage-specific data (with vintage)
+            vintage_result = None
+            if with_vintage_query and not is_non_vintage:
+                await asyncio.sleep(random.uniform(3.0, 5.0))  # Delay between searches
+                vintage_result = await enhanced_vivino_lookup(browser, with_vintage_query)
+                if config.DEBUG:
+                    print(f"[enhanced] Vintage search result: {vintage_result}")
+        
+            vivino_data = (vintage_result, overall_result, vintage_year)
+        
+    except Exception as e:
+        if config.DEBUG:
+            print(f"[enhanced] Vivino lookup failed: {e}")
+        vivino_data = None
+    
+    # Send notification
+    try:
+        print("[enhanced] Sending Telegram notification...")
+        await telegram_send(deal, vivino_data, client=telegram_client)
+        print("[enhanced] ✅ Notification sent!")
+        return True
+    except Exception as e:
+        print(f"[enhanced] ❌ Failed to send notification: {e}")
+        # Try sending without Vivino data as fallback
+        try:
+            print("[enhanced] Trying fallback notification without Vivino data...")
+            await telegram_send(deal, None, client=telegram_client)
+            print("[enhanced] ✅ Fallback notification sent!")
+            return True
+        except Exception as e2:
+            print(f"[enhanced] ❌ Fallback notification also failed: {e2}")
+            return False
+
 async def run_enhanced_watcher():
     """Enhanced watcher with working deal detection + improved Vivino lookups"""
     print(f"[enhanced] Starting enhanced watcher - DEBUG={config.DEBUG}")
@@ -158,6 +227,9 @@ async def run_enhanced_watcher():
     
     # Start playwright
     p = await async_playwright().start()
+    # One Bot API client for the whole run so notifications reuse its connection
+    telegram_client = httpx.AsyncClient(timeout=10)
+    pending_notifications: set[asyncio.Task] = set()
     try:
         browser = await p.chromium.launch(headless=not config.HEADFUL)
         # Use the same simple context as minimal version for LastBottle
@@ -171,6 +243,13 @@ async def run_enhanced_watcher():
         # Track the last deal we saw
         last_deal_id = None
         notification_count = 0
+
+        def _on_notified(task):
+            nonlocal notification_count
+            pending_notifications.discard(task)
+            if not task.cancelled() and task.exception() is None and task.result():
+                notification_count += 1
+                print(f"[enhanced] Notifications sent: {notification_count}")
         
         print("[enhanced] Starting deal monitoring loop...")
         
@@ -191,6 +270,18 @@ async def run_enhanced_watcher():
                 if config.DEBUG:
                     print(f"[enhanced] Current: title='{title}' price={price}")
                 
+                # Create deal ID and check it first: an unchanged deal is the common
+                # case, and it was already vetted when it was first seen
+                current_deal_id = _deal_id(title)
+                
+                if config.DEBUG:
+                    print(f"[enhanced] Deal ID: current='{current_deal_id}' last='{last_deal_id}'")
+                
+                if current_deal_id == last_deal_id:
+                    if config.DEBUG:
+                        print("[enhanced] Same deal, no notification needed")
+                    continue
+                
                 # Skip if no title or generic title
                 if not title or config.is_generic_title(title):
                     if config.DEBUG and title:
@@ -203,14 +294,8 @@ async def run_enhanced_watcher():
                         print(f"[enhanced] Skipping low price: {price}")
                     price = None
                 
-                # Create deal ID
-                current_deal_id = _deal_id(title)
-                
-                if config.DEBUG:
-                    print(f"[enhanced] Deal ID: current='{current_deal_id}' last='{last_deal_id}'")
-                
                 # Check if this is a new deal
-                if current_deal_id and current_deal_id != last_deal_id:
+                if current_deal_id:
                     print(f"[enhanced] 🎉 NEW DEAL DETECTED!")
                     print(f"[enhanced] Title: {title}")
                     print(f"[enhanced] Price: ${price:.2f}" if price else "[enhanced] Price: Unknown")
@@ -224,68 +309,14 @@ async def run_enhanced_watcher():
                         url=config.LASTBOTTLE_URL
                     )
                     
-                    # Try to get Vivino data
-                    vivino_data = None
-                    try:
-                        print("[enhanced] Looking up Vivino data...")
-                        
-                        # Check if this is a non-vintage wine
-                        is_non_vintage = ' NV' in title or ' Non-Vintage' in title or ' non-vintage' in title
-                        
-                        # Extract vintage year
-                        vintage_year = None
-                        if not is_non_vintage:
-                            year_match = re.search(r'\b(19|20)\d{2}\b', title)
-                            vintage_year = year_match.group(0) if year_match else None
-                        
-                        # Create queries
-                        with_vintage_query = title
-                        without_vintage_query = re.sub(r'\b(19|20)\d{2}\b','', title).strip() if vintage_year else title
-                        
-                        # Search for overall data (without vintage)
-                        overall_result = None
-                        if without_vintage_query != with_vintage_query or is_non_vintage:
-                            overall_result = await enhanced_vivino_lookup(browser, without_vintage_query)
-                            if config.DEBUG:
-                                print(f"[enhanced] Overall search result: {overall_result}")
-                        
-                        # Search for vintage-specific data (with vintage)
-                        vintage_result = None
-                        if with_vintage_query and not is_non_vintage:
-                            await asyncio.sleep(random.uniform(3.0, 5.0))  # Delay between searches
-                            vintage_result = await enhanced_vivino_lookup(browser, with_vintage_query)
-                            if config.DEBUG:
-                                print(f"[enhanced] Vintage search result: {vintage_result}")
-                        
-                        vivino_data = (vintage_result, overall_result, vintage_year)
-                        
-                    except Exception as e:
-                        if config.DEBUG:
-                            print(f"[enhanced] Vivino lookup failed: {e}")
-                        vivino_data = None
-                    
-                    # Send notification
-                    try:
-                        print("[enhanced] Sending Telegram notification...")
-                        await telegram_send(deal, vivino_data)
-                        notification_count += 1
-                        print(f"[enhanced] ✅ Notification sent! (Total: {notification_count})")
-                    except Exception as e:
-                        print(f"[enhanced] ❌ Failed to send notification: {e}")
-                        # Try sending without Vivino data as fallback
-                        try:
-                            print("[enhanced] Trying fallback notification without Vivino data...")
-                            await telegram_send(deal, None)
-                            notification_count += 1
-                            print(f"[enhanced] ✅ Fallback notification sent! (Total: {notification_count})")
-                        except Exception as e2:
-                            print(f"[enhanced] ❌ Fallback notification also failed: {e2}")
+                    # Enrich and notify in the background so the next poll isn't held up
+                    # by Vivino searches; the task set keeps a reference until it finishes
+                    task = asyncio.create_task(_notify_deal(browser, deal, title, telegram_client))
+                    pending_notifications.add(task)
+                    task.add_done_callback(_on_notified)
                     
                     # Update last deal
                     last_deal_id = current_deal_id
-                else:
-                    if config.DEBUG:
-                        print("[enhanced] Same deal, no notification needed")
                 
             except Exception as e:
                 print(f"[enhanced] ❌ Error in main loop: {e}")
@@ -295,6 +326,11 @@ async def run_enhanced_watcher():
                 continue
                 
     finally:
+        # Don't close the browser under notifications that are still running
+        for task in pending_notifications:
+            task.cancel()
+        await asyncio.gather(*pending_notifications, return_exceptions=True)
+
         # Stop keeping computer awake
         await stop_keep_awake()
         
@@ -307,3 +343,7 @@ async def run_enhanced_watcher():
             await p.stop()
         except:
             pass
+        try:
+            await telegram_client.aclose()
+        except:
+            pass
@@ -0,0 +1,41 @@
+"""Shared fixtures for the wine deal scanner tests."""
+
+import os
+
+import httpx
+import pytest
+import pytest_asyncio
+
+
+def pytest_addoption(parser):
+    parser.addoption("--live", action="store_true", default=False,
+                     help="Run tests marked 'live' against the real websites.")
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip tests marked ``live`` unless --live or LIVE_TESTS=1 (checked once per session)."""
+    if config.getoption("--live") or os.getenv("LIVE_TESTS") == "1":
+        return
+    skip_live = pytest.mark.skip(reason="Live tests are disabled. Pass --live or set LIVE_TESTS=1 to enable.")
+    for item in items:
+        if "live" in item.keywords:
+            item.add_marker(skip_live)
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def vivino_browser():
+    """One headless Chromium shared by every live Vivino test in the session."""
+    # Imported lazily: only live runs need Playwright loaded
+    from playwright.async_api import async_playwright
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        yield browser
+        await browser.close()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def vivino_http_client():
+    """One keep-alive httpx client shared by every live Vivino page fetch."""
+    async with httpx.AsyncClient() as client:
+        yield client
@@ -1,33 +1,41 @@
 """Tests for data models."""
 
 import pytest
+from pydantic import ValidationError
 
-from app.models import normalize_bottle_size
+from app.models import Deal, EnrichedDeal, normalize_bottle_size
+
+# (title, expected ml) cases for normalize_bottle_size, built once at import
+_SIZE_CASES: tuple[tuple[str | None, int], ...] = (
+    ("Napa Cab 2020 (Magnum 1.5L)", 1500),
+    ("Barolo NV 375 ml", 375),
+    ("Champagne Brut (Split 187ML)", 187),
+    ("Rhone Rouge 0.75 L", 750),
+    ("Just a wine title with no size", 750),
+    ("Double Magnum 3L", 3000),
+    # Additional test cases
+    ("Burgundy Half Bottle", 375),
+    ("Demi bottle of Chablis", 375),
+    ("Imperial 6L Bordeaux", 6000),
+    ("Jeroboam Champagne", 3000),
+    ("Piccolo Prosecco", 187),
+    ("1000 ml bottle", 1000),
+    ("500ml size", 500),
+    ("2.5 L bottle", 2500),
+    ("720ml Japanese sake style", 720),
+    ("Empty string should default", 750),
+    # Named formats only count as whole words
+    ("Chablis (Demi)", 375),
+    ("Demi-Sec Champagne", 750),
+    ("Splitting Image Zinfandel", 750),
+    (None, 750),
+)
 
 
 class TestNormalizeBottleSize:
     """Tests for the normalize_bottle_size function."""
 
-    @pytest.mark.parametrize("text,expected", [
-        ("Napa Cab 2020 (Magnum 1.5L)", 1500),
-        ("Barolo NV 375 ml", 375),
-        ("Champagne Brut (Split 187ML)", 187),
-        ("Rhone Rouge 0.75 L", 750),
-        ("Just a wine title with no size", 750),
-        ("Double Magnum 3L", 3000),
-        # Additional test cases
-        ("Burgundy Half Bottle", 375),
-        ("Demi bottle of Chablis", 375),
-        ("Imperial 6L Bordeaux", 6000),
-        ("Jeroboam Champagne", 3000),
-        ("Piccolo Prosecco", 187),
-        ("1000 ml bottle", 1000),
-        ("500ml size", 500),
-        ("2.5 L bottle", 2500),
-        ("720ml Japanese sake style", 720),
-        ("Empty string should default", 750),
-        (None, 750),
-    ])
+    @pytest.mark.parametrize("text,expected", _SIZE_CASES)
     def test_normalize_bottle_size(self, text: str, expected: int) -> None:
         """Test bottle size normalization with various formats."""
         assert normalize_bottle_size(text) == expected
@@ -57,3 +65,28 @@ class TestNormalizeBottleSize:
 
         # Numbers without proper units
         assert normalize_bottle_size("Just 1500 without units") == 750
+
+
+class TestFrozenModels:
+    """Tests that deal models are immutable value objects."""
+
+    def test_deal_is_frozen_and_hashable(self) -> None:
+        """Test that Deal rejects assignment and hashes by value."""
+        deal = Deal(title="Opus One 2018", price=299.99, url="https://lastbottle.com")
+
+        with pytest.raises(ValidationError):
+            deal.price = 199.99
+
+        assert hash(deal) == hash(deal.model_copy())
+
+    def test_enriched_deal_model_copy_update(self) -> None:
+        """Test that EnrichedDeal is frozen but still derivable via model_copy."""
+        enriched = EnrichedDeal(wine_name="Opus One", vintage=2018, deal_price=299.99)
+
+        with pytest.raises(ValidationError):
+            enriched.vintage_rating = 4.5
+
+        updated = enriched.model_copy(update={"vintage_rating": 4.5})
+        assert updated.vintage_rating == 4.5
+        assert updated.has_vivino_data
+        assert not enriched.has_vivino_data
@@ -1,16 +1,81 @@
 """Tests for Telegram notification functionality."""
 
-from unittest.mock import patch
+import re
+from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from app.models import EnrichedDeal
 from app.notify import (
     TelegramError,
     _format_enriched_deal_message,
+    _send_telegram_message,
     send_telegram_message,
 )
 
+# Header, size, price, vintage, overall and savings lines of the complete deal, in order
+_COMPLETE_DEAL_LINES = (
+    "🍷 New Deal: Caymus Cabernet Sauvignon 2019",
+    "Size: 750ml",
+    "Deal Price: $85.99",
+    "Vivino (vintage): 4.3⭐ — avg ($120.00) — 1500 reviews",
+    "Vivino (overall): 4.1⭐ — avg ($110.00) — 8000 reviews",
+    "💰 Save $34.01 (28.3% off Vivino avg)",
+)
+_COMPLETE_DEAL_RE = re.compile(".*".join(map(re.escape, _COMPLETE_DEAL_LINES)), re.S)
+
+# Prefixes that only appear when a deal has Vivino data
+_VIVINO_ONLY_LINES = ("Vivino (vintage):", "Vivino (overall):", "💰 Save")
+
+
+def assert_all_in(message: str, expected: tuple[str, ...], combined: re.Pattern[str]) -> None:
+    """Check every expected substring with one regex pass.
+
+    Only on a miss does it fall back to per-substring asserts, so a failure
+    still names the line that is missing.
+    """
+    if combined.search(message):
+        return
+    for text in expected:
+        assert text in message
+
+
+class AsyncStub:
+    """Minimal async callable standing in for AsyncMock on the send path.
+
+    Supports the subset the tests use: return_value, side_effect, call_args
+    and assert_called_once().
+    """
+
+    __slots__ = ("return_value", "side_effect", "calls")
+
+    def __init__(self, return_value=None, side_effect=None):
+        self.return_value = return_value
+        self.side_effect = side_effect
+        self.calls = []
+
+    async def __call__(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        if self.side_effect is not None:
+            raise self.side_effect
+        return self.return_value
+
+    @property
+    def call_args(self):
+        return self.calls[-1] if self.calls else None
+
+    def assert_called_once(self) -> None:
+        assert len(self.calls) == 1, f"expected 1 call, got {len(self.calls)}"
+
+
+@pytest.fixture
+def mock_send(monkeypatch):
+    """Replace _send_telegram_message with an AsyncStub the test configures."""
+    stub = AsyncStub()
+    monkeypatch.setattr("app.notify._send_telegram_message", stub)
+    return stub
+
 
 class TestFormatEnrichedDealMessage:
     """Tests for enriched deal message formatting."""
@@ -32,21 +97,7 @@ class TestFormatEnrichedDealMessage:
 
         message = _format_enriched_deal_message(enriched)
 
-        # Check header
-        assert "🍷 New Deal: Caymus Cabernet Sauvignon 2019" in message
-
-        # Check basic info
-        assert "Size: 750ml" in message
-        assert "Deal Price: $85.99" in message
-
-        # Check vintage data
-        assert "Vivino (vintage): 4.3⭐ — avg ($120.00) — 1500 reviews" in message
-
-        # Check overall data
-        assert "Vivino (overall): 4.1⭐ — avg ($110.00) — 8000 reviews" in message
-
-        # Check savings calculation
-        assert "💰 Save $34.01 (28.3% off Vivino avg)" in message
+        assert_all_in(message, _COMPLETE_DEAL_LINES, _COMPLETE_DEAL_RE)
 
     def test_format_no_vintage_wine(self) -> None:
         """Test formatting wine without vintage."""
@@ -131,9 +182,7 @@ class TestFormatEnrichedDealMessage:
         assert "Deal Price: $35.00" in message
 
         # Should not have Vivino data
-        assert "Vivino (vintage):" not in message
-        assert "Vivino (overall):" not in message
-        assert "💰 Save" not in message
+        assert not any(text in message for text in _VIVINO_ONLY_LINES)
 
     def test_format_expensive_deal(self) -> None:
         """Test formatting when deal price is higher than Vivino."""
@@ -183,8 +232,7 @@ class TestFormatEnrichedDealMessage:
 class TestSendTelegramMessage:
     """Tests for the send_telegram_message function."""
 
-    @pytest.mark.asyncio
-    async def test_send_message_success(self) -> None:
+    async def test_send_message_success(self, mock_send) -> None:
         """Test successful message sending."""
         enriched = EnrichedDeal(
             wine_name="Test Wine",
@@ -196,83 +244,73 @@ class TestSendTelegramMessage:
             overall_reviews=1500
         )
 
-        with patch('app.notify._send_telegram_message') as mock_send:
-            mock_send.return_value = True
+        mock_send.return_value = True
 
-            result = await send_telegram_message(enriched)
+        result = await send_telegram_message(enriched)
 
-            assert result is True
-            mock_send.assert_called_once()
+        assert result is True
+        mock_send.assert_called_once()
 
-            # Check the formatted message was passed
-            call_args = mock_send.call_args
-            message = call_args[0][1]  # Second argument is the message
-            assert "🍷 New Deal: Test Wine 2020" in message
-            assert "Deal Price: $50.00" in message
+        # Check the formatted message was passed
+        call_args = mock_send.call_args
+        message = call_args[0][1]  # Second argument is the message
+        assert "🍷 New Deal: Test Wine 2020" in message
+        assert "Deal Price: $50.00" in message
 
-    @pytest.mark.asyncio
-    async def test_send_message_telegram_error(self) -> None:
+    async def test_send_message_telegram_error(self, mock_send) -> None:
         """Test handling of Telegram API errors."""
         enriched = EnrichedDeal(
             wine_name="Error Wine",
             deal_price=30.00
         )
 
-        with patch('app.notify._send_telegram_message') as mock_send:
-            mock_send.side_effect = TelegramError("API Error")
+        mock_send.side_effect = TelegramError("API Error")
 
-            result = await send_telegram_message(enriched)
+        result = await send_telegram_message(enriched)
 
-            assert result is False
+        assert result is False
 
-    @pytest.mark.asyncio
-    async def test_send_message_timeout(self) -> None:
+    async def test_send_message_timeout(self, mock_send) -> None:
         """Test handling of timeout errors."""
         enriched = EnrichedDeal(
             wine_name="Timeout Wine",
             deal_price=40.00
         )
 
-        with patch('app.notify._send_telegram_message') as mock_send:
-            mock_send.side_effect = TimeoutError("Request timed out")
+        mock_send.side_effect = TimeoutError("Request timed out")
 
-            result = await send_telegram_message(enriched, timeout_s=1.0)
+        result = await send_telegram_message(enriched, timeout_s=1.0)
 
-            assert result is False
+        assert result is False
 
-    @pytest.mark.asyncio
-    async def test_send_message_unexpected_error(self) -> None:
+    async def test_send_message_unexpected_error(self, mock_send) -> None:
         """Test handling of unexpected errors."""
         enriched = EnrichedDeal(
             wine_name="Exception Wine",
             deal_price=35.00
         )
 
-        with patch('app.notify._send_telegram_message') as mock_send:
-            mock_send.side_effect = Exception("Unexpected error")
+        mock_send.side_effect = Exception("Unexpected error")
 
-            result = await send_telegram_message(enriched)
+        result = await send_telegram_message(enriched)
 
-            assert result is False
+        assert result is False
 
-    @pytest.mark.asyncio
-    async def test_send_message_with_custom_timeout(self) -> None:
+    async def test_send_message_with_custom_timeout(self, mock_send) -> None:
         """Test sending message with custom timeout."""
         enriched = EnrichedDeal(
             wine_name="Custom Timeout Wine",
             deal_price=25.00
         )
 
-        with patch('app.notify._send_telegram_message') as mock_send:
-            mock_send.return_value = True
+        mock_send.return_value = True
 
-            result = await send_telegram_message(enriched, timeout_s=15.0)
+        result = await send_telegram_message(enriched, timeout_s=15.0)
 
-            assert result is True
-            mock_send.assert_called_once()
+        assert result is True
+        mock_send.assert_called_once()
 
-    @pytest.mark.asyncio
-    async def test_send_message_logging(self) -> None:
+    async def test_send_message_logging(self, mock_send) -> None:
         """Test that appropriate logging occurs."""
         enriched = EnrichedDeal(
             wine_name="Logging Test Wine",
@@ -280,8 +318,7 @@ class TestSendTelegramMessage:
             deal_price=75.00
         )
 
-        with patch('app.notify._send_telegram_message') as mock_send, \
-             patch('app.notify.logger') as mock_logger, \
+        with patch('app.notify.logger') as mock_logger, \
              patch('app.notify.TELEGRAM_CHAT_ID', 'test_chat_id'):
 
             mock_send.return_value = True
@@ -305,16 +342,14 @@ class TestSendTelegramMessage:
                 chat_id='test_chat_id'
             )
 
-    @pytest.mark.asyncio
-    async def test_send_message_error_logging(self) -> None:
+    async def test_send_message_error_logging(self, mock_send) -> None:
         """Test error logging on failure."""
         enriched = EnrichedDeal(
             wine_name="Error Logging Wine",
             deal_price=45.00
         )
 
-        with patch('app.notify._send_telegram_message') as mock_send, \
-             patch('app.notify.logger') as mock_logger:
+        with patch('app.notify.logger') as mock_logger:
 
             mock_send.side_effect = TelegramError("Test error")
 
@@ -327,6 +362,27 @@ class TestSendTelegramMessage:
                 error="Test error"
             )
 
+    async def test_send_reuses_given_client(self) -> None:
+        """Test that a shared client is used as-is and left open."""
+        client = AsyncMock(spec=httpx.AsyncClient)
+        client.post.return_value = MagicMock(status_code=200)
+
+        await _send_telegram_message("123", "hello", timeout_s=5.0, client=client)
+        await _send_telegram_message("123", "again", timeout_s=5.0, client=client)
+
+        assert client.post.await_count == 2
+        assert client.post.call_args.kwargs["json"] == {"chat_id": "123", "text": "again"}
+        assert client.post.call_args.kwargs["timeout"] == 5.0
+        client.aclose.assert_not_called()
+
+    async def test_send_with_client_raises_on_rejection(self) -> None:
+        """Test that a non-200 reply through a shared client raises TelegramError."""
+        client = AsyncMock(spec=httpx.AsyncClient)
+        client.post.return_value = MagicMock(status_code=400, text="Bad Request")
+
+        with pytest.raises(TelegramError, match="HTTP 400"):
+            await _send_telegram_message("123", "hello", client=client)
+
 
 class TestMessageFormatting:
     """Tests for message formatting edge cases."""
@@ -374,6 +430,21 @@ class TestMessageFormatting:
         # Should not show savings when it's zero
         assert "💰 Save" not in message
 
+    def test_message_formatting_zero_vintage_price(self) -> None:
+        """Test that a zero vintage price is still the reference, so no savings line."""
+        enriched = EnrichedDeal(
+            wine_name="Zero Vintage Price Wine",
+            vintage=2019,
+            deal_price=50.00,
+            vintage_price=0.0,
+            overall_price=80.00,
+        )
+
+        message = _format_enriched_deal_message(enriched)
+
+        # Savings are never computed against the overall price when a vintage price is set
+        assert "💰 Save" not in message
+
     def test_message_formatting_high_precision_values(self) -> None:
         """Test message formatting with high precision decimal values."""
         enriched = EnrichedDeal(
@@ -395,8 +466,7 @@ class TestMessageFormatting:
 class TestTelegramIntegration:
     """Integration tests for Telegram functionality."""
 
-    @pytest.mark.asyncio
-    async def test_full_telegram_workflow(self) -> None:
+    async def test_full_telegram_workflow(self, mock_send) -> None:
         """Test complete Telegram workflow."""
         # Create a realistic enriched deal
         enriched = EnrichedDeal(
@@ -412,24 +482,23 @@ class TestTelegramIntegration:
             overall_reviews=5200
         )
 
-        with patch('app.notify._send_telegram_message') as mock_send:
-            mock_send.return_value = True
+        mock_send.return_value = True
 
-            result = await send_telegram_message(enriched)
+        result = await send_telegram_message(enriched)
 
-            assert result is True
+        assert result is True
 
-            # Verify the formatted message content
-            call_args = mock_send.call_args
-            message = call_args[0][1]
+        # Verify the formatted message content
+        call_args = mock_send.call_args
+        message = call_args[0][1]
 
-            # Check all expected components
-            assert "🍷 New Deal: Opus One 2018" in message
-            assert "Size: 750ml" in message
-            assert "Deal Price: $349.99" in message
-            assert "Vivino (vintage): 4.4⭐ — avg ($450.00) — 850 reviews" in message
-            assert "Vivino (overall): 4.3⭐ — avg ($425.00) — 5200 reviews" in message
-            assert "💰 Save $100.01 (22.2% off Vivino avg)" in message
+        # Check all expected components
+        assert "🍷 New Deal: Opus One 2018" in message
+        assert "Size: 750ml" in message
+        assert "Deal Price: $349.99" in message
+        assert "Vivino (vintage): 4.4⭐ — avg ($450.00) — 850 reviews" in message
+        assert "Vivino (overall): 4.3⭐ — avg ($425.00) — 5200 reviews" in message
+        assert "💰 Save $100.01 (22.2% off Vivino avg)" in message
 
     def test_message_structure_consistency(self) -> None:
         """Test that message structure is consistent across different inputs."""
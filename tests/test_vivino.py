@@ -2,6 +2,7 @@
 
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import httpx
 import pytest
 
 from app.vivino import (
@@ -12,6 +13,17 @@ from app.vivino import (
 )
 
 
+def make_resp(payload, raises=None):
+    """Mock httpx response whose raise_for_status raises ``raises`` or passes."""
+    resp = MagicMock()
+    if raises is not None:
+        resp.raise_for_status.side_effect = raises
+    else:
+        resp.raise_for_status.return_value = None
+    resp.json.return_value = payload
+    return resp
+
+
 class TestNormalizeWineName:
     """Tests for wine name normalization."""
 
@@ -20,18 +32,16 @@ class TestNormalizeWineName:
         result = _normalize_wine_name("Caymus Cabernet Sauvignon")
         assert result == "Caymus Cabernet Sauvignon"
 
-    def test_normalize_removes_wine_terms(self) -> None:
+    @pytest.mark.parametrize("input_name,expected", [
+        ("Caymus Red Wine", "Caymus"),
+        ("Domaine White Wine", "Domaine"),
+        ("Champagne Sparkling Wine", "Champagne"),
+        ("Rosé Wine from Provence", "from Provence"),
+    ])
+    def test_normalize_removes_wine_terms(self, input_name: str, expected: str) -> None:
         """Test removal of common wine terms."""
-        test_cases = [
-            ("Caymus Red Wine", "Caymus"),
-            ("Domaine White Wine", "Domaine"),
-            ("Champagne Sparkling Wine", "Champagne"),
-            ("Rosé Wine from Provence", "from Provence"),
-        ]
-
-        for input_name, expected in test_cases:
-            result = _normalize_wine_name(input_name)
-            assert result == expected
+        result = _normalize_wine_name(input_name)
+        assert result == expected
 
     def test_normalize_handles_extra_spaces(self) -> None:
         """Test handling of extra whitespace."""
@@ -42,104 +52,50 @@ class TestNormalizeWineName:
 class TestExtractWineData:
     """Tests for wine data extraction."""
 
-    def test_extract_complete_data(self) -> None:
-        """Test extraction of complete wine data."""
-        wine_data = {
-            "wine": {
-                "average_rating": 4.2,
-                "ratings_count": 1500,
-                "price": 89.99
-            }
-        }
-
-        result = _extract_wine_data(wine_data)
-        assert result["rating"] == 4.2
-        assert result["reviews"] == 1500
-        assert result["price"] == 89.99
-
-    def test_extract_flat_structure(self) -> None:
-        """Test extraction from flat data structure."""
-        wine_data = {
-            "average_rating": 3.8,
-            "reviews_count": 750,
-            "average_price": 45.50
-        }
-
-        result = _extract_wine_data(wine_data)
-        assert result["rating"] == 3.8
-        assert result["reviews"] == 750
-        assert result["price"] == 45.50
-
-    def test_extract_nested_price_structure(self) -> None:
-        """Test extraction from nested price structure."""
-        wine_data = {
-            "wine": {
-                "rating": 4.5,
-                "num_reviews": 2000,
-                "price_data": {
-                    "amount": 125.00
-                }
-            }
-        }
-
-        result = _extract_wine_data(wine_data)
-        assert result["rating"] == 4.5
-        assert result["reviews"] == 2000
-        assert result["price"] == 125.00
-
-    def test_extract_statistics_structure(self) -> None:
-        """Test extraction from statistics structure."""
-        wine_data = {
-            "score": 4.1,
-            "review_count": 500,
-            "statistics": {
-                "average_price": 75.25
-            }
-        }
-
-        result = _extract_wine_data(wine_data)
-        assert result["rating"] == 4.1
-        assert result["reviews"] == 500
-        assert result["price"] == 75.25
-
-    def test_extract_partial_data(self) -> None:
-        """Test extraction with missing fields."""
-        wine_data = {
-            "wine": {
-                "average_rating": 3.9
-                # Missing reviews and price
-            }
-        }
-
-        result = _extract_wine_data(wine_data)
-        assert result["rating"] == 3.9
-        assert result["reviews"] is None
-        assert result["price"] is None
-
-    def test_extract_invalid_data(self) -> None:
-        """Test extraction with invalid data types."""
-        wine_data = {
-            "average_rating": "invalid",
-            "ratings_count": "not_a_number",
-            "price": "not_a_price"
-        }
-
-        result = _extract_wine_data(wine_data)
-        assert result["rating"] is None
-        assert result["reviews"] is None
-        assert result["price"] is None
+    @pytest.mark.parametrize("wine_data,expected", [
+        pytest.param(
+            {"wine": {"average_rating": 4.2, "ratings_count": 1500, "price": 89.99}},
+            {"rating": 4.2, "reviews": 1500, "price": 89.99},
+            id="complete",
+        ),
+        pytest.param(
+            {"average_rating": 3.8, "reviews_count": 750, "average_price": 45.50},
+            {"rating": 3.8, "reviews": 750, "price": 45.50},
+            id="flat",
+        ),
+        pytest.param(
+            {"wine": {"rating": 4.5, "num_reviews": 2000, "price_data": {"amount": 125.00}}},
+            {"rating": 4.5, "reviews": 2000, "price": 125.00},
+            id="nested-price",
+        ),
+        pytest.param(
+            {"score": 4.1, "review_count": 500, "statistics": {"average_price": 75.25}},
+            {"rating": 4.1, "reviews": 500, "price": 75.25},
+            id="statistics",
+        ),
+        pytest.param(
+            {"wine": {"average_rating": 3.9}},  # Missing reviews and price
+            {"rating": 3.9, "reviews": None, "price": None},
+            id="partial",
+        ),
+        pytest.param(
+            {"average_rating": "invalid", "ratings_count": "not_a_number", "price": "not_a_price"},
+            {"rating": None, "reviews": None, "price": None},
+            id="invalid-types",
+        ),
+    ])
+    def test_extract_wine_data(self, wine_data: dict, expected: dict) -> None:
+        """Test extraction across the JSON shapes Vivino returns."""
+        assert _extract_wine_data(wine_data) == expected
 
 
 class TestSearchVivinoComprehensive:
     """Tests for comprehensive Vivino search."""
 
-    @pytest.mark.asyncio
     async def test_search_success_first_endpoint(self) -> None:
         """Test successful search on first endpoint."""
-        mock_client = AsyncMock()
-        mock_response = MagicMock()
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {
+        mock_client = AsyncMock(spec=httpx.AsyncClient)
+        mock_client.get.return_value = make_resp({
             "matches": [
                 {
                     "wine": {
@@ -148,8 +104,7 @@ class TestSearchVivinoComprehensive:
                     }
                 }
             ]
-        }
-        mock_client.get.return_value = mock_response
+        })
 
         result = await _search_vivino_comprehensive(mock_client, "test wine", "general")
 
@@ -157,26 +112,22 @@ class TestSearchVivinoComprehensive:
         assert result["wine"]["average_rating"] == 4.3
         mock_client.get.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_search_fallback_endpoints(self) -> None:
         """Test fallback to alternative endpoints."""
-        mock_client = AsyncMock()
+        mock_client = AsyncMock(spec=httpx.AsyncClient)
 
         # First endpoint fails
-        first_response = MagicMock()
-        first_response.raise_for_status.side_effect = Exception("HTTP Error")
+        first_response = make_resp(None, raises=Exception("HTTP Error"))
 
         # Second endpoint succeeds
-        second_response = MagicMock()
-        second_response.raise_for_status.return_value = None
-        second_response.json.return_value = {
+        second_response = make_resp({
             "results": [
                 {
                     "average_rating": 4.0,
                     "reviews_count": 800
                 }
             ]
-        }
+        })
 
         mock_client.get.side_effect = [first_response, second_response]
 
@@ -186,14 +137,10 @@ class TestSearchVivinoComprehensive:
         assert result["average_rating"] == 4.0
         assert mock_client.get.call_count == 2
 
-    @pytest.mark.asyncio
     async def test_search_no_results(self) -> None:
         """Test search with no results."""
-        mock_client = AsyncMock()
-        mock_response = MagicMock()
-        mock_response.raise_for_status.return_value = None
-        mock_response.json.return_value = {"matches": []}
-        mock_client.get.return_value = mock_response
+        mock_client = AsyncMock(spec=httpx.AsyncClient)
+        mock_client.get.return_value = make_resp({"matches": []})
 
         result = await _search_vivino_comprehensive(mock_client, "nonexistent wine", "general")
 
@@ -203,7 +150,6 @@ class TestSearchVivinoComprehensive:
 class TestGetVivinoInfo:
     """Tests for the main get_vivino_info function."""
 
-    @pytest.mark.asyncio
     async def test_get_info_with_vintage(self) -> None:
         """Test getting info with vintage specified."""
         vintage_data = {
@@ -237,7 +183,6 @@ class TestGetVivinoInfo:
             # Should have made two searches
             assert mock_search.call_count == 2
 
-    @pytest.mark.asyncio
     async def test_get_info_without_vintage(self) -> None:
         """Test getting info without vintage."""
         general_data = {
@@ -263,7 +208,6 @@ class TestGetVivinoInfo:
             # Should have made only one search (no vintage)
             mock_search.assert_called_once()
 
-    @pytest.mark.asyncio
     async def test_get_info_vintage_fails_general_succeeds(self) -> None:
         """Test when vintage search fails but general succeeds."""
         general_data = {
@@ -287,7 +231,6 @@ class TestGetVivinoInfo:
 
             assert mock_search.call_count == 2
 
-    @pytest.mark.asyncio
     async def test_get_info_both_searches_fail(self) -> None:
         """Test when both searches fail."""
         with patch('app.vivino._search_vivino_comprehensive') as mock_search:
@@ -300,7 +243,6 @@ class TestGetVivinoInfo:
 
             assert mock_search.call_count == 2
 
-    @pytest.mark.asyncio
     async def test_get_info_timeout_handling(self) -> None:
         """Test timeout handling."""
         with patch('app.vivino._search_vivino_comprehensive') as mock_search:
@@ -311,7 +253,6 @@ class TestGetVivinoInfo:
             # Should return empty result on timeout
             assert all(value is None for value in result.values())
 
-    @pytest.mark.asyncio
     async def test_get_info_partial_data(self) -> None:
         """Test handling of partial data."""
         vintage_data = {
@@ -341,7 +282,6 @@ class TestGetVivinoInfo:
             assert result["overall_price"] == 120.00
             assert result["overall_reviews"] == 3000
 
-    @pytest.mark.asyncio
     async def test_get_info_wine_name_normalization(self) -> None:
         """Test that wine names are properly normalized."""
         with patch('app.vivino._search_vivino_comprehensive') as mock_search, \
@@ -368,7 +308,6 @@ class TestGetVivinoInfo:
 class TestVivinoIntegration:
     """Integration tests for Vivino functionality."""
 
-    @pytest.mark.asyncio
     async def test_real_wine_search_format(self) -> None:
         """Test with realistic wine data format."""
         # Mock a realistic Vivino API response